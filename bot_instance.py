@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Bot Instance Kilidi
+main.py ve restart_bot.py için ortak PID ve hazır olma dosyaları
+"""
+
+import os
+import time
+import psutil
+
+# Tek instance kilidi ve restart_bot.py ile hazır olma sinyali
+PID_FILE = "bot.pid"
+READY_FILE = "bot.ready"
+
+def read_pid(file_path):
+    """PID dosyasını oku"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def write_pid(file_path):
+    """Bu process'in PID'ini dosyaya yaz"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(str(os.getpid()))
+
+def is_bot_process(proc):
+    """Process bu dizindeki main.py mi"""
+    try:
+        cmdline = proc.cmdline()
+        if not any(os.path.basename(arg) == "main.py" for arg in cmdline):
+            return False
+        return os.path.samefile(proc.cwd(), os.getcwd())
+    except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+        return False
+
+def is_bot_running(pid):
+    """PID'e ait başka bir bot process'i çalışıyor mu"""
+    if pid is None or pid <= 0 or pid == os.getpid():
+        return False
+
+    try:
+        # PID yeniden kullanılmış olabilir, bu dizindeki main.py olduğunu doğrula
+        return is_bot_process(psutil.Process(pid))
+    except psutil.NoSuchProcess:
+        return False
+
+def acquire_pid_file():
+    """PID dosyasını atomik olarak oluştur, başka bot çalışıyorsa False"""
+    for _ in range(3):
+        try:
+            fd = os.open(PID_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            pid = read_pid(PID_FILE)
+            if pid is None:
+                # Başka bir process dosyayı yeni oluşturmuş olabilir
+                time.sleep(0.1)
+                pid = read_pid(PID_FILE)
+
+            if is_bot_running(pid):
+                return False
+
+            # Eski dosya; arada başka process devralmadıysa sil
+            if read_pid(PID_FILE) == pid:
+                try:
+                    os.remove(PID_FILE)
+                except FileNotFoundError:
+                    pass
+            continue
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+        return True
+
+    return False
+
+def release_pid_files():
+    """Bu process'e ait PID ve hazır dosyalarını sil"""
+    for file_path in (PID_FILE, READY_FILE):
+        if read_pid(file_path) == os.getpid():
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
@@ -6,16 +6,102 @@ Trading Bot - Ana Program
 """
 
 import asyncio
+import importlib
 import signal
 import sys
-from utils.logger import setup_logger, get_logger
-from api.telegram_api import setup_telegram_bot
-from api.binance_api import setup_binance_client, test_binance_connection
-from data.state import initialize_state
-from trading.executor import start_trading
+import threading
+import time
+from bot_instance import (
+    PID_FILE, READY_FILE, read_pid, write_pid,
+    acquire_pid_file, release_pid_files
+)
 
 logger = None
 
+# Açılışta import süresi için hedef (saniye)
+STARTUP_IMPORT_BUDGET = 3.0
+
+# Telegram ayağa kalktıktan sonra arka planda ısıtılacak ağır modüller
+PREWARM_MODULES = [
+    "trading.executor",
+    "trading.pretrained_models",
+    "trading.ai_integration",
+]
+
+# Kurulu olmayabilecek AI modülleri; diğerleri zorunlu
+OPTIONAL_MODULES = {
+    "trading.pretrained_models",
+    "trading.ai_integration",
+}
+
+# Devir modunda eski instance'ın kapanmasını bekleme süresi (saniye)
+HANDOVER_TIMEOUT = 300
+
+import_timings = []
+
+# Isıtılamayan zorunlu modüller
+prewarm_failures = []
+
+def timed_import(module_name):
+    """Modülü import et ve süresini kaydet"""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_timings.append((module_name, time.perf_counter() - start))
+    return module
+
+def report_import_timings():
+    """Açılış import sürelerini logla"""
+    total = sum(duration for _, duration in import_timings)
+    
+    for module_name, duration in import_timings:
+        logger.info(f"⏱️ import {module_name}: {duration * 1000:.0f} ms")
+    
+    # api.telegram_api'nin modül seviyesinde yüklediği her şey
+    # (trading/backtest modülleri dahil) bu toplama girer
+    if total > STARTUP_IMPORT_BUDGET:
+        logger.warning(f"⚠️ Import süresi {total:.2f} sn, alt modüller dahil (hedef: {STARTUP_IMPORT_BUDGET:.1f} sn)")
+    else:
+        logger.info(f"⏱️ Toplam import süresi: {total:.2f} sn, alt modüller dahil")
+
+def prewarm_modules():
+    """Ağır modülleri arka planda yükle"""
+    for module_name in PREWARM_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+            logger.info(f"🔥 {module_name} ısıtıldı ({time.perf_counter() - start:.2f} sn)")
+        except ModuleNotFoundError as e:
+            # Sadece modülün kendisi yoksa ve opsiyonelse atla;
+            # içeride eksik bağımlılık (pandas, ta, sklearn...) gerçek hatadır
+            if e.name == module_name and module_name in OPTIONAL_MODULES:
+                logger.info(f"ℹ️ {module_name} kurulu değil, atlanıyor")
+            else:
+                report_prewarm_failure(module_name, e)
+        except Exception as e:
+            report_prewarm_failure(module_name, e)
+
+def report_prewarm_failure(module_name, error):
+    """Isıtma hatasını logla, zorunlu modülleri kaydet"""
+    if module_name in OPTIONAL_MODULES:
+        logger.warning(f"⚠️ {module_name} ısıtılamadı: {error}")
+    else:
+        logger.error(f"❌ {module_name} yüklenemedi: {error}")
+        prewarm_failures.append(module_name)
+
+async def wait_for_handover():
+    """Eski instance kapanınca PID dosyasını devral"""
+    logger.info("🔁 Hazır, devir bekleniyor...")
+    
+    deadline = time.monotonic() + HANDOVER_TIMEOUT
+    while not acquire_pid_file():
+        if time.monotonic() > deadline:
+            logger.error(f"❌ PID {read_pid(PID_FILE)} kapanmadı, devir alınamadı!")
+            return False
+        await asyncio.sleep(0.2)
+    
+    logger.info("✅ Devir alındı")
+    return True
+
 def signal_handler(signum, frame):
     """Temiz kapatma için sinyal handler"""
     global logger
@@ -32,6 +118,7 @@ async def main():
         print("🚀 Trading Bot Başlatılıyor...")
         
         # Logger'ı kur
+        setup_logger = timed_import("utils.logger").setup_logger
         logger = setup_logger()
         logger.info("=" * 60)
         logger.info("🤖 TRADING BOT BAŞLATILIYOR")
@@ -41,6 +128,22 @@ async def main():
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
+        # Devir modunda yeni instance eski çalışırken ısınır,
+        # PID dosyasını ısınma bittikten sonra alır
+        handover = "--handover" in sys.argv[1:]
+        
+        if not handover and not acquire_pid_file():
+            logger.error(f"❌ Bot zaten çalışıyor (PID {read_pid(PID_FILE)})")
+            return False
+        
+        # Açılışta gereken modüller. main.py artık trading.executor'ı
+        # doğrudan import etmez; api.telegram_api'nin modül seviyesinde
+        # yüklediği trading/backtest modülleri yine burada yüklenir
+        initialize_state = timed_import("data.state").initialize_state
+        binance_api = timed_import("api.binance_api")
+        setup_telegram_bot = timed_import("api.telegram_api").setup_telegram_bot
+        report_import_timings()
+        
         # Bot durumunu başlat
         logger.info("⚙️ Bot durumu başlatılıyor...")
         if not initialize_state():
@@ -49,11 +152,11 @@ async def main():
         
         # Binance bağlantısını test et
         logger.info("🔗 Binance bağlantısı test ediliyor...")
-        if not setup_binance_client():
+        if not binance_api.setup_binance_client():
             logger.error("❌ Binance bağlantısı kurulamadı!")
             return False
         
-        if not test_binance_connection():
+        if not binance_api.test_binance_connection():
             logger.error("❌ Binance API erişimi başarısız!")
             return False
         
@@ -64,6 +167,32 @@ async def main():
             logger.error("❌ Telegram bot başlatılamadı!")
             return False
         
+        # Ağır modülleri arka planda ısıt
+        prewarm_thread = threading.Thread(target=prewarm_modules, name="prewarm", daemon=True)
+        prewarm_thread.start()
+        
+        if handover:
+            # Modeller yüklenmeden devir alma
+            await asyncio.to_thread(prewarm_thread.join)
+            
+            if prewarm_failures:
+                logger.error(f"❌ Zorunlu modüller yüklenemedi, devir alınmıyor: {', '.join(prewarm_failures)}")
+                return False
+        
+        # restart_bot.py bu sinyali bekler. Devir modunda modeller
+        # ısındıktan sonra yazılır; normal açılışta ısınma arka planda sürer
+        write_pid(READY_FILE)
+        
+        if handover:
+            if not await wait_for_handover():
+                return False
+            
+            # Isınma sırasında eski instance'ın kaydettiği durumu yükle.
+            # Trading döngüsü devredilmez, /start_bot ile yeniden başlatılır
+            if not initialize_state():
+                logger.error("❌ Bot durumu yeniden yüklenemedi!")
+                return False
+        
         logger.info("✅ Bot başarıyla başlatıldı!")
         logger.info("📱 Telegram'dan /start komutu ile test edebilirsiniz")
         
@@ -82,6 +211,8 @@ async def main():
         return False
     
     finally:
+        release_pid_files()
+        
         if logger:
             logger.info("🏁 Bot kapatılıyor...")
         print("👋 Bot kapatıldı!")
@@ -3,7 +3,9 @@
 
 """
 Bot Yeniden Başlatma Scripti
-Botu güvenli şekilde durdurur ve AI entegrasyonu ile yeniden başlatır
+Yeni instance'ı eski çalışırken ısıtır, hazır olunca devri yaptırır
+ve AI entegrasyonu ile yeniden başlatır. Trading döngüsü devredilmez,
+yeniden başlatmadan sonra /start_bot gerekir.
 """
 
 import os
@@ -13,26 +15,50 @@ import signal
 import subprocess
 import psutil
 from datetime import datetime
+from bot_instance import (
+    PID_FILE, READY_FILE, read_pid, is_bot_process, is_bot_running
+)
+
+# Yeni instance'ın ısınması için beklenecek süre (saniye)
+READY_TIMEOUT = 180
+
+def find_running_bot():
+    """PID dosyasına kayıtlı çalışan bot process'ini bul"""
+    pid = read_pid(PID_FILE)
+    if not is_bot_running(pid):
+        return None
+    
+    try:
+        # Process nesnesi başlama zamanını saklar; PID sonradan başka
+        # bir process'e geçerse is_running() False döner
+        proc = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return None
+    
+    return proc if is_bot_process(proc) else None
 
 def find_bot_processes():
     """Bot process'lerini bul"""
+    # Önce PID dosyası
+    proc = find_running_bot()
+    if proc:
+        return [proc]
+    
+    # PID dosyası olmadan başlatılmış eski sürümler
     bot_processes = []
     
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-            if 'main.py' in cmdline or 'trading' in cmdline.lower():
-                bot_processes.append(proc)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    for proc in psutil.process_iter(['pid']):
+        if proc.pid != os.getpid() and is_bot_process(proc):
+            bot_processes.append(proc)
     
     return bot_processes
 
-def stop_bot_processes():
+def stop_bot_processes(processes=None):
     """Bot process'lerini durdur"""
     print("🛑 Bot process'leri durduruluyor...")
     
-    processes = find_bot_processes()
+    if processes is None:
+        processes = find_bot_processes()
     
     if not processes:
         print("✅ Çalışan bot process'i bulunamadı")
@@ -55,7 +81,7 @@ def stop_bot_processes():
     
     # Son kontrol
     time.sleep(2)
-    remaining = find_bot_processes()
+    remaining = [proc for proc in processes if proc.is_running()]
     
     if remaining:
         print(f"⚠️ {len(remaining)} process hala çalışıyor")
@@ -185,64 +211,170 @@ def run_ai_setup():
         print(f"❌ AI entegrasyonu hatası: {e}")
         return False
 
-def start_bot():
+def start_bot(handover=False):
     """Botu başlat"""
     print("🚀 Bot başlatılıyor...")
     
     if not os.path.exists("main.py"):
         print("❌ main.py bulunamadı!")
-        return False
+        return None
+    
+    command = [sys.executable, "main.py"]
+    if handover:
+        command.append("--handover")
     
     try:
         # Bot'u arka planda başlat
         if os.name == 'nt':  # Windows
-            subprocess.Popen([
-                sys.executable, "main.py"
-            ], creationflags=subprocess.CREATE_NEW_CONSOLE)
+            proc = subprocess.Popen(
+                command, creationflags=subprocess.CREATE_NEW_CONSOLE
+            )
         else:  # Linux/Mac
-            subprocess.Popen([
-                sys.executable, "main.py"
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            proc = subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
         
-        print("✅ Bot başlatıldı!")
-        print("📱 Telegram'dan /ai_test komutu ile test edin")
-        return True
+        print(f"✅ Bot başlatıldı: PID {proc.pid}")
+        return proc
         
     except Exception as e:
         print(f"❌ Bot başlatma hatası: {e}")
+        return None
+
+def instance_pids(proc):
+    """Başlatılan process ve alt process'lerinin PID'leri"""
+    # Windows venv'de python.exe asıl yorumlayıcıyı alt process olarak başlatır
+    pids = {proc.pid}
+    
+    try:
+        pids.update(child.pid for child in psutil.Process(proc.pid).children(recursive=True))
+    except psutil.NoSuchProcess:
+        pass
+    
+    return pids
+
+def kill_process_tree(proc):
+    """Başlatılan process'i alt process'leriyle birlikte kapat"""
+    try:
+        children = psutil.Process(proc.pid).children(recursive=True)
+    except psutil.NoSuchProcess:
+        children = []
+    
+    for child in children:
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+    
+    if proc.poll() is None:
+        proc.kill()
+    
+    psutil.wait_procs(children, timeout=5)
+
+def wait_for_ready(proc, timeout=READY_TIMEOUT):
+    """Yeni instance'ın hazır sinyalini bekle"""
+    print("⏳ Yeni instance ısınıyor...")
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            print(f"❌ Yeni instance kapandı (çıkış kodu {proc.returncode})")
+            return False
+        
+        # Eski bot arada kapandıysa yeni instance PID dosyasını doğrudan alır
+        pids = instance_pids(proc)
+        if read_pid(READY_FILE) in pids or read_pid(PID_FILE) in pids:
+            print("✅ Yeni instance hazır")
+            return True
+        
+        time.sleep(0.5)
+    
+    print("❌ Yeni instance zamanında hazır olmadı")
+    return False
+
+def wait_for_takeover(proc, timeout=30):
+    """Yeni instance'ın PID dosyasını devraldığını doğrula"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        if read_pid(PID_FILE) in instance_pids(proc):
+            return True
+        time.sleep(0.2)
+    
+    return False
+
+def handover_restart(old_proc):
+    """Eski bot çalışırken yenisini ısıt, sonra devret"""
+    print(f"🔁 Devirli yeniden başlatma (eski PID {old_proc.pid})")
+    
+    proc = start_bot(handover=True)
+    if not proc:
         return False
+    
+    if not wait_for_ready(proc):
+        kill_process_tree(proc)
+        
+        if old_proc.is_running():
+            print("⚠️ Devir iptal edildi, eski bot çalışmaya devam ediyor")
+        else:
+            print("❌ Devir iptal edildi, çalışan bot yok! Manuel olarak başlatın.")
+        return False
+    
+    # Eski instance kapatılır, yenisi PID dosyasını devralır.
+    # Isınma sırasında kapandıysa PID başka process'e geçmiş olabilir
+    old_processes = [old_proc] if old_proc.is_running() else []
+    if not stop_bot_processes(old_processes):
+        print("⚠️ Eski bot durdurulamadı, yeni instance devri bekliyor")
+        return False
+    
+    if not wait_for_takeover(proc):
+        print("❌ Yeni instance devri alamadı!")
+        return False
+    
+    print("✅ Devir tamamlandı!")
+    return True
 
 def main():
     """Ana fonksiyon"""
     print("🔄 BOT YENİDEN BAŞLATMA SİSTEMİ")
     print("=" * 50)
     
-    # Adım 1: Bot'u durdur
-    if not stop_bot_processes():
-        print("❌ Bot durdurulamadı! Manuel olarak durdurun.")
-        return
+    # Hazırlık adımları eski bot çalışırken yapılır
     
-    # Adım 2: Veri yedekle
+    # Adım 1: Veri yedekle
     backup_dir = backup_data()
     
-    # Adım 3: AI dosyalarını kontrol et
+    # Adım 2: AI dosyalarını kontrol et
     if not check_ai_files():
         print("\n❌ AI dosyaları eksik! Önce AI dosyalarını ekleyin.")
         return
     
-    # Adım 4: Paketleri yükle
+    # Adım 3: Paketleri yükle
     if not install_requirements():
         print("\n❌ Paket yükleme başarısız!")
         return
     
-    # Adım 5: AI entegrasyonu
+    # Adım 4: AI entegrasyonu
     if not run_ai_setup():
         print("\n⚠️ AI entegrasyonu başarısız! Manuel kurulum gerekebilir.")
         print("📚 Detaylar için: entegrasyon_rehberi.md")
     
-    # Adım 6: Bot'u başlat
-    if start_bot():
+    # Adım 5: Yeni bot'u başlat ve devret
+    old_proc = find_running_bot()
+    
+    if old_proc:
+        started = handover_restart(old_proc)
+    else:
+        # PID dosyası olmayan eski sürümler devir yapamaz
+        if not stop_bot_processes():
+            print("❌ Bot durdurulamadı! Manuel olarak durdurun.")
+            return
+        started = start_bot() is not None
+    
+    if started:
         print("\n🎉 YENİDEN BAŞLATMA TAMAMLANDI!")
+        print("⚠️ Trading durdu, /start_bot gönderene kadar işlem yapılmaz")
         print("\n📱 Sonraki adımlar:")
         print("1. /ai_test - AI modellerini test edin")
         print("2. /ai_setup balanced - AI'ı aktif edin")